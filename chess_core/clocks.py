@@ -1,14 +1,16 @@
 # chess_core/clocks.py
 from __future__ import annotations
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    # Monotonic: immune to NTP steps/wall-clock jumps, and integer math only.
+    # Timestamps are only ever compared to each other within a clock instance.
+    return time.monotonic_ns() // 1_000_000
 
 
-@dataclass
+@dataclass(slots=True)
 class ClockState:
     base_ms: int = 5 * 60_000  # default 5 minutes
     inc_ms: int = 0  # default 0 increment
@@ -16,24 +18,41 @@ class ClockState:
     b_ms: int = 5 * 60_000
     running: bool = False
     turn: str = "w"  # "w" or "b"
-    started_at_ms: int | None = None
+    started_at_ms: int | None = None  # monotonic ms (see _now_ms), not wall time
     flagged: str | None = None  # "w" or "b" when someone flags
 
     def to_dict(self):
-        return asdict(self)
+        # Hand-written literal: asdict() goes through field reflection and
+        # deepcopy, which is wasteful for a flat snapshot taken per state push.
+        return {
+            "base_ms": self.base_ms,
+            "inc_ms": self.inc_ms,
+            "w_ms": self.w_ms,
+            "b_ms": self.b_ms,
+            "running": self.running,
+            "turn": self.turn,
+            "started_at_ms": self.started_at_ms,
+            "flagged": self.flagged,
+        }
 
 
 class ChessClocks:
     """
     Server-side authoritative chess clocks with increment.
     - Call start(turn) to begin.
-    - Call on_move(moved_by='w'|'b') to commit elapsed and add increment.
+    - Call on_move(moved_by='w'|'b') to commit elapsed and add increment;
+      it returns the fresh snapshot.
     - Call pause() to pause clocks.
     - Call reset(turn='w') to reset to base.
     - Call snapshot() anytime to get up-to-date times (applies live elapsed).
     """
 
+    __slots__ = ("state", "_snap_base")
+
     def __init__(self, base_ms: int = 5 * 60_000, inc_ms: int = 0, turn: str = "w"):
+        # Static part of snapshot(), rebuilt only after a state change; the
+        # live elapsed delta is applied on top per call.
+        self._snap_base: dict | None = None
         self.state = ClockState(
             base_ms=base_ms,
             inc_ms=inc_ms,
@@ -47,6 +66,7 @@ class ChessClocks:
 
     # ----- control -----
     def configure(self, base_ms: int, inc_ms: int, turn: str = "w"):
+        self._snap_base = None
         was_running = self.state.running
         self.pause()
         self.state = ClockState(
@@ -63,6 +83,7 @@ class ChessClocks:
             self.start(turn)
 
     def start(self, turn: str | None = None):
+        self._snap_base = None
         if turn in ("w", "b"):
             self.state.turn = turn
         if self.state.flagged:
@@ -74,11 +95,13 @@ class ChessClocks:
     def pause(self):
         if not self.state.running:
             return
+        self._snap_base = None
         self._apply_elapsed()
         self.state.running = False
         self.state.started_at_ms = None
 
     def reset(self, turn: str = "w"):
+        self._snap_base = None
         self.pause()
         self.state.w_ms = self.state.base_ms
         self.state.b_ms = self.state.base_ms
@@ -86,12 +109,15 @@ class ChessClocks:
         self.state.turn = turn
 
     # ----- events -----
-    def on_move(self, moved_by: str):
+    def on_move(self, moved_by: str) -> dict:
         """
-        Commit time for the mover, add increment, then pass turn and continue running.
+        Commit time for the mover, add increment, then pass turn and continue
+        running. Returns the fresh snapshot so callers pushing state don't
+        follow up with a second snapshot() call (and a second dict build).
         """
         if self.state.flagged:
-            return
+            return self.snapshot()
+        self._snap_base = None
         if self.state.running:
             self._apply_elapsed()
         # add increment to the side that just moved (if they haven't flagged)
@@ -105,6 +131,7 @@ class ChessClocks:
         if not self.state.flagged:
             self.state.started_at_ms = _now_ms()
             self.state.running = True
+        return self.snapshot()
 
     # ----- queries -----
     def snapshot(self) -> dict:
@@ -113,44 +140,52 @@ class ChessClocks:
         Does not mutate increment; only computes view.
         """
         s = self.state
-        w_ms, b_ms = s.w_ms, s.b_ms
+        base = self._snap_base
+        if base is None:
+            # If someone is at zero without the authoritative flag (set in
+            # _apply_elapsed), mark flagged in the view.
+            flagged = s.flagged
+            if not flagged:
+                if s.w_ms <= 0:
+                    flagged = "w"
+                elif s.b_ms <= 0:
+                    flagged = "b"
+            base = self._snap_base = {
+                "base_ms": s.base_ms,
+                "inc_ms": s.inc_ms,
+                "w_ms": s.w_ms,
+                "b_ms": s.b_ms,
+                "running": s.running,
+                "turn": s.turn,
+                "flagged": flagged,
+            }
+        snap = dict(base)
         if s.running and s.started_at_ms is not None and not s.flagged:
-            elapsed = _now_ms() - s.started_at_ms
-            if s.turn == "w":
-                w_ms = max(0, w_ms - elapsed)
-            else:
-                b_ms = max(0, b_ms - elapsed)
-        flagged = s.flagged
-        # If someone just hit zero, mark flagged in view (authoritatively set on _apply_elapsed)
-        if not flagged:
-            if w_ms <= 0:
-                flagged = "w"
-            elif b_ms <= 0:
-                flagged = "b"
-        return {
-            "base_ms": s.base_ms,
-            "inc_ms": s.inc_ms,
-            "w_ms": w_ms,
-            "b_ms": b_ms,
-            "running": s.running,
-            "turn": s.turn,
-            "flagged": flagged,
-        }
+            # Only the ticking side's remaining time differs from the base:
+            # one monotonic delta, one clamp.
+            key = "w_ms" if s.turn == "w" else "b_ms"
+            remaining = snap[key] - (_now_ms() - s.started_at_ms)
+            if remaining <= 0:
+                remaining = 0
+                snap["flagged"] = s.turn
+            snap[key] = remaining
+        return snap
 
     # ----- internals -----
     def _apply_elapsed(self):
         s = self.state
         if not s.running or s.started_at_ms is None or s.flagged:
             return
-        elapsed = _now_ms() - s.started_at_ms
-        if s.turn == "w":
-            s.w_ms -= elapsed
-            if s.w_ms <= 0:
-                s.w_ms = 0
-                s.flagged = "w"
+        now = _now_ms()
+        # Single update arm for either side: compute remaining once, clamp,
+        # and flag in the same pass (no duplicated per-side branch bodies).
+        white = s.turn == "w"
+        remaining = (s.w_ms if white else s.b_ms) - (now - s.started_at_ms)
+        if remaining <= 0:
+            remaining = 0
+            s.flagged = s.turn
+        if white:
+            s.w_ms = remaining
         else:
-            s.b_ms -= elapsed
-            if s.b_ms <= 0:
-                s.b_ms = 0
-                s.flagged = "b"
-        s.started_at_ms = _now_ms()
+            s.b_ms = remaining
+        s.started_at_ms = now
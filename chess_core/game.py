@@ -3,12 +3,65 @@ import datetime as dt
 import chess
 import chess.pgn
 
+from chess_core import zobrist
+
+
+# Unicode glyph per piece symbol, indexed by ord(symbol); built once at import
+# so get_board_unicode never reconstructs the mapping.
+_PIECE_UNICODE = [" "] * 128
+for _sym, _glyph in (
+    ("P", "♙"),
+    ("N", "♘"),
+    ("B", "♗"),
+    ("R", "♖"),
+    ("Q", "♕"),
+    ("K", "♔"),
+    ("p", "♟"),
+    ("n", "♞"),
+    ("b", "♝"),
+    ("r", "♜"),
+    ("q", "♛"),
+    ("k", "♚"),
+):
+    _PIECE_UNICODE[ord(_sym)] = _glyph
+del _sym, _glyph
+
 
 class ChessGame:
     """Core chess game logic using python-chess."""
 
     def __init__(self):
         self.board = chess.Board()
+        # SAN strings cached per pushed move so move-list rendering is O(1)
+        # instead of replaying the whole game on every poll.
+        self._sans: list[str] = []
+        # Incremental Zobrist hash of the current position plus a history of
+        # hashes since the last irreversible move (capture/pawn push), so
+        # repetition queries never walk the full move stack.
+        self._zobrist: int = zobrist.hash_board(self.board)
+        # Whether the current hash includes an ep-file key (only true when a
+        # legal en-passant capture exists; see zobrist.EP_FILE_KEYS).
+        self._ep_hashed: bool = self.board.has_legal_en_passant()
+        self._hash_hist: list[int] = [self._zobrist]
+        # Derived-status caches keyed by (ply, position hash); status polls
+        # between moves become dict lookups instead of movegen. The ply part
+        # keeps repeated positions (whose draw status differs) distinct.
+        self._status_flags_cache: tuple[tuple, dict] | None = None
+        self._status_cache: tuple[tuple, str] | None = None
+        # Full legal-move map for the current position, bucketed by source
+        # square: the UI asks /legal/<square> on every click, so one movegen
+        # pass serves the whole turn.
+        self._legal_map_cache: tuple[tuple, dict] | None = None
+        # PGN game tree grown alongside the board so export_pgn never replays
+        # the move stack.
+        self._pgn_root = chess.pgn.Game()
+        self._pgn_tail: chess.pgn.GameNode = self._pgn_root
+        # FEN string cached until the next mutation; clock-tick broadcasts
+        # re-serialize the same position many times between moves.
+        self._fen_cache: str | None = None
+
+    def _status_key(self) -> tuple:
+        return (len(self.board.move_stack), self._zobrist)
 
     # ----------------------- Selection helpers -----------------------
     def legal_moves_from(self, square_name: str) -> list[str]:
@@ -17,11 +70,25 @@ class ChessGame:
             from_square = chess.parse_square(square_name)
         except ValueError:
             return []
-        moves = []
+        return self._legal_map().get(from_square, [])
+
+    def _legal_map(self) -> dict:
+        """All legal destinations for the current position, by source square.
+
+        Generated once per position and cached, so a turn's worth of
+        /legal/<square> clicks costs a single movegen pass.
+        """
+        key = self._status_key()
+        cached = self._legal_map_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        legal_map: dict[int, list[str]] = {}
         for mv in self.board.legal_moves:
-            if mv.from_square == from_square:
-                moves.append(chess.square_name(mv.to_square))
-        return moves
+            legal_map.setdefault(mv.from_square, []).append(
+                chess.square_name(mv.to_square)
+            )
+        self._legal_map_cache = (key, legal_map)
+        return legal_map
 
     # ----------------------- Core move API -----------------------
     def is_move_legal(self, move_uci: str) -> bool:
@@ -29,25 +96,192 @@ class ChessGame:
             move = chess.Move.from_uci(move_uci)
         except ValueError:
             return False
-        return move in self.board.legal_moves
+        # is_legal checks the single move; no need to enumerate legal_moves.
+        return self.board.is_legal(move)
 
     def push_move(self, move_uci: str) -> bool:
         """Apply a legal move in UCI. Disallow moves after game over."""
         if self.board.is_game_over():
             return False
-        if self.is_move_legal(move_uci):
-            self.board.push(chess.Move.from_uci(move_uci))
-            return True
-        return False
+        try:
+            move = chess.Move.from_uci(move_uci)
+        except ValueError:
+            return False
+        if not self.board.is_legal(move):
+            return False
+        # SAN must be computed against the pre-push board.
+        san = self.board.san(move)
+        self._push_and_rehash(move)
+        self._sans.append(san)
+        self._pgn_tail = self._pgn_tail.add_variation(move)
+        return True
+
+    def _push_and_rehash(self, move: chess.Move) -> None:
+        """Push a legal move and update the Zobrist hash incrementally."""
+        board = self.board
+        piece = board.piece_at(move.from_square)
+        h = self._zobrist
+
+        # Moved piece leaves its source square.
+        h ^= zobrist.piece_key(piece, move.from_square)
+
+        # Remove the captured piece (en passant captures off the to-square).
+        if board.is_en_passant(move):
+            cap_sq = move.to_square + (-8 if piece.color == chess.WHITE else 8)
+            h ^= zobrist.piece_key(board.piece_at(cap_sq), cap_sq)
+        else:
+            captured = board.piece_at(move.to_square)
+            if captured is not None:
+                h ^= zobrist.piece_key(captured, move.to_square)
+
+        # Piece (or promotion piece) arrives on the destination square.
+        if move.promotion:
+            h ^= zobrist.piece_key(
+                chess.Piece(move.promotion, piece.color), move.to_square
+            )
+        else:
+            h ^= zobrist.piece_key(piece, move.to_square)
+
+        # Castling also relocates the rook.
+        if board.is_castling(move):
+            kingside = chess.square_file(move.to_square) > chess.square_file(
+                move.from_square
+            )
+            rook = chess.Piece(chess.ROOK, piece.color)
+            back = chess.square_rank(move.from_square) * 8
+            rook_from = back + (7 if kingside else 0)
+            rook_to = back + (5 if kingside else 3)
+            h ^= zobrist.piece_key(rook, rook_from)
+            h ^= zobrist.piece_key(rook, rook_to)
+
+        irreversible = board.is_zeroing(move)
+        old_castling = board.castling_rights
+        old_ep = board.ep_square
+        # Simple moves (no castling/ep/promotion, no ep or castling-rights
+        # delta) touch at most two ranks, so the cached FEN can be patched
+        # instead of rebuilt from all 64 squares.
+        prev_fen = self._fen_cache
+        patchable = (
+            prev_fen is not None
+            and not move.promotion
+            and old_ep is None
+            and not board.is_castling(move)
+        )
+        board.push(move)
+
+        # Fold in the castling/ep/turn deltas now that the board advanced.
+        if board.castling_rights != old_castling:
+            h ^= zobrist.castling_key(old_castling)
+            h ^= zobrist.castling_key(board.castling_rights)
+        if self._ep_hashed:
+            h ^= zobrist.EP_FILE_KEYS[chess.square_file(old_ep)]
+        # Gate the new ep key on a legal capture existing: a phantom ep
+        # square must hash like its ep-less recurrence or repetitions stall.
+        self._ep_hashed = board.has_legal_en_passant()
+        if self._ep_hashed:
+            h ^= zobrist.EP_FILE_KEYS[chess.square_file(board.ep_square)]
+        h ^= zobrist.TURN_KEY
+
+        self._zobrist = h
+        if irreversible:
+            # No earlier position can repeat across a capture/pawn move.
+            self._hash_hist.clear()
+        self._hash_hist.append(h)
+        if (
+            patchable
+            and board.ep_square is None
+            and board.castling_rights == old_castling
+        ):
+            self._fen_cache = self._patch_fen(prev_fen, move)
+        else:
+            self._fen_cache = None
+
+    def _fen_rank(self, rank: int) -> str:
+        """Serialize one rank of the current board in FEN notation."""
+        piece_at = self.board.piece_at
+        out = []
+        empty = 0
+        for file in range(8):
+            piece = piece_at(chess.square(file, rank))
+            if piece is None:
+                empty += 1
+            else:
+                if empty:
+                    out.append(str(empty))
+                    empty = 0
+                out.append(piece.symbol())
+        if empty:
+            out.append(str(empty))
+        return "".join(out)
+
+    def _patch_fen(self, prev_fen: str, move: chess.Move) -> str:
+        """Patch the pre-move FEN after a simple move: re-serialize only the
+        source/destination ranks and the trailing integer fields."""
+        board = self.board
+        placement, _rest = prev_fen.split(" ", 1)
+        ranks = placement.split("/")  # ranks[0] is rank 8
+        for rank in {
+            chess.square_rank(move.from_square),
+            chess.square_rank(move.to_square),
+        }:
+            ranks[7 - rank] = self._fen_rank(rank)
+        return (
+            f"{'/'.join(ranks)} {'w' if board.turn else 'b'}"
+            f" {_rest.split(' ')[1]} -"
+            f" {board.halfmove_clock} {board.fullmove_number}"
+        )
+
+    def _rehash(self) -> None:
+        """Recompute the hash and reset the history (position replaced)."""
+        self._zobrist = zobrist.hash_board(self.board)
+        self._ep_hashed = self.board.has_legal_en_passant()
+        self._hash_hist = [self._zobrist]
+        self._fen_cache = None
+
+    def is_threefold(self) -> bool:
+        """True if the current position occurred at least three times."""
+        return self._repetition_count() >= 3
+
+    def _repetition_count(self) -> int:
+        """
+        How many times the current position has occurred.
+
+        Only entries with the same side to move can match, so the scan steps
+        backwards by two plies; the history itself is already truncated at the
+        last irreversible move.
+        """
+        hist = self._hash_hist
+        current = self._zobrist
+        count = 1
+        for i in range(len(hist) - 3, -1, -2):
+            if hist[i] == current:
+                count += 1
+        return count
 
     def san_move_list(self) -> list[str]:
         """Return SAN strings for all moves in the current game (from the start)."""
+        return list(self._sans)
+
+    def _rebuild_san_cache(self) -> None:
+        """Recompute the SAN cache by replaying the move stack once."""
         temp = chess.Board()
         sans = []
         for mv in self.board.move_stack:
             sans.append(temp.san(mv))
             temp.push(mv)
-        return sans
+        self._sans = sans
+
+    def _rebuild_pgn_tree(self) -> None:
+        """Regrow the PGN tree from the current board (position replaced)."""
+        root = chess.pgn.Game()
+        start = self.board.root()
+        if start.fen() != chess.STARTING_FEN:
+            root.setup(start)
+        node = root
+        for mv in self.board.move_stack:
+            node = node.add_variation(mv)
+        self._pgn_root = root
+        self._pgn_tail = node
 
     # ----------------------- Status / Flags -----------------------
     def status_flags(self) -> dict:
@@ -60,33 +294,64 @@ class ChessGame:
           - check_square: "e1"/"e8"/None (king in check)
           - result: "1-0"/"0-1"/"1/2-1/2"/None
         """
-        in_check = self.board.is_check()
+        key = self._status_key()
+        cached = self._status_flags_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        # Look the king up once and test its attackers directly; is_check()
+        # would repeat the same king lookup internally.
+        color = self.board.turn
+        king_sq = self.board.king(color)
+        in_check = king_sq is not None and bool(
+            self.board.attackers_mask(not color, king_sq)
+        )
+        check_square = chess.square_name(king_sq) if in_check else None
         in_mate = self.board.is_checkmate()
         over = self.board.is_game_over()
-        turn_white = self.board.turn
-        check_square = None
-        if in_check:
-            ks = self.board.king(chess.WHITE if turn_white else chess.BLACK)
-            if ks is not None:
-                check_square = chess.square_name(ks)
-        return {
+        result = self.board.result(claim_draw=True) if over else None
+        if not over and (
+            self.board.halfmove_clock >= 100 or self._repetition_count() >= 3
+        ):
+            # Claimable draws (fifty-move / threefold) end the game for the
+            # UI, via the O(1) halfmove clock and the incremental repetition
+            # count. Unlike is_game_over(claim_draw=True) this has no one-ply
+            # lookahead for draws only claimable after the next move; callers
+            # must use this flag (not the python-chess predicate) so clocks
+            # and flags agree.
+            over = True
+            result = "1/2-1/2"
+        turn_white = color
+        flags = {
             "check": in_check,
             "mate": in_mate,
             "game_over": over,
             "turn": "w" if turn_white else "b",
             "check_square": check_square,
-            "result": self.board.result(claim_draw=True) if over else None,
+            "result": result,
         }
+        self._status_flags_cache = (key, flags)
+        return flags
 
     def game_status(self) -> str:
         """Human-readable status line."""
+        key = self._status_key()
+        cached = self._status_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        status = self._compute_game_status()
+        self._status_cache = (key, status)
+        return status
+
+    def _compute_game_status(self) -> str:
         if self.board.is_checkmate():
             return "Checkmate"
         if self.board.is_stalemate():
             return "Stalemate"
         if self.board.is_insufficient_material():
             return "Draw by insufficient material"
-        if self.board.is_seventyfive_moves() or self.board.is_fivefold_repetition():
+        # Check the O(1) halfmove clock before the repetition scan.
+        if self.board.halfmove_clock >= 150 or self._repetition_count() >= 5:
             return "Draw by rule"
         if self.board.is_game_over():
             return "Game Over"
@@ -97,38 +362,29 @@ class ChessGame:
     # --------- Rendering helper (legacy, still useful for tests) ----------
     def get_board_unicode(self):
         """Return board as 2D list of Unicode chess pieces for rendering."""
-        piece_unicode = {
-            "P": "♙",
-            "N": "♘",
-            "B": "♗",
-            "R": "♖",
-            "Q": "♕",
-            "K": "♔",
-            "p": "♟",
-            "n": "♞",
-            "b": "♝",
-            "r": "♜",
-            "q": "♛",
-            "k": "♚",
-        }
+        piece_at = self.board.piece_at
         board_rows = []
-        for rank in range(8, 0, -1):
+        for rank in range(7, -1, -1):
             row = []
-            for file in range(1, 9):
-                square = chess.square(file - 1, rank - 1)
-                piece = self.board.piece_at(square)
-                symbol = piece_unicode.get(piece.symbol(), " ") if piece else " "
-                row.append(symbol)
+            for file in range(8):
+                piece = piece_at(chess.square(file, rank))
+                row.append(_PIECE_UNICODE[ord(piece.symbol())] if piece else " ")
             board_rows.append(row)
         return board_rows
 
     # ----------------------- FEN / PGN -----------------------
     def get_fen(self) -> str:
-        return self.board.fen()
+        fen = self._fen_cache
+        if fen is None:
+            fen = self._fen_cache = self.board.fen()
+        return fen
 
     def set_fen(self, fen: str) -> bool:
         try:
             self.board.set_fen(fen)
+            self._rebuild_san_cache()
+            self._rehash()
+            self._rebuild_pgn_tree()
             return True
         except Exception:
             return False
@@ -146,15 +402,16 @@ class ChessGame:
             for mv in game.mainline_moves():
                 board.push(mv)
             self.board = board
+            self._rebuild_san_cache()
+            self._rehash()
+            self._rebuild_pgn_tree()
             return True
         except Exception:
             return False
 
-    def export_pgn(self) -> str:
-        """
-        Build a PGN from the current move stack. If the game is over, include the result header; otherwise '*'.
-        """
-        game = chess.pgn.Game()
+    def _stamp_headers(self) -> chess.pgn.Game:
+        """Refresh the export headers on the persistent PGN tree."""
+        game = self._pgn_root
         game.headers["Event"] = "Local Game"
         game.headers["Site"] = "chess_app"
         game.headers["Date"] = dt.date.today().strftime("%Y.%m.%d")
@@ -165,16 +422,50 @@ class ChessGame:
             if self.board.is_game_over(claim_draw=True)
             else "*"
         )
+        return game
 
-        node = game
-        temp = chess.Board()
-        for mv in self.board.move_stack:
-            node = node.add_variation(mv)
-            temp.push(mv)
-
+    def export_pgn(self) -> str:
+        """
+        Build a PGN from the current move stack. If the game is over, include the result header; otherwise '*'.
+        """
+        # The game tree is maintained incrementally in push_move; only the
+        # headers and the exporter pass remain per call.
+        game = self._stamp_headers()
         out = io.StringIO()
         exporter = chess.pgn.StringExporter(
             headers=True, variations=False, comments=False
         )
         out.write(game.accept(exporter))
         return out.getvalue()
+
+    def iter_pgn(self, moves_per_chunk: int = 50):
+        """Yield the PGN incrementally: header lines, then movetext chunks.
+
+        Streams straight off the cached SAN list, so exporting never holds
+        the full PGN string in memory regardless of game length.
+        """
+        game = self._stamp_headers()
+        for name, value in game.headers.items():
+            yield f'[{name} "{value}"]\n'
+        yield "\n"
+
+        # Move numbering must respect a non-standard start position.
+        start = self.board.root()
+        fullmove = start.fullmove_number
+        white_to_move = start.turn
+        buf: list[str] = []
+        for i, san in enumerate(self._sans):
+            if white_to_move:
+                buf.append(f"{fullmove}. {san}")
+            elif i == 0:
+                buf.append(f"{fullmove}... {san}")
+            else:
+                buf.append(san)
+            if not white_to_move:
+                fullmove += 1
+            white_to_move = not white_to_move
+            if len(buf) >= moves_per_chunk:
+                yield " ".join(buf) + " "
+                buf = []
+        buf.append(game.headers["Result"])
+        yield " ".join(buf) + "\n"
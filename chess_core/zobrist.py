@@ -0,0 +1,68 @@
+# chess_core/zobrist.py
+"""
+Zobrist hashing tables for fast position keys.
+
+The tables are generated once at import time from a fixed seed (Polyglot-style
+layout: piece x square, castling rights, en-passant file, side to move) so
+hashes are stable within a process and across runs. ChessGame updates its hash
+incrementally with XOR on every push, which makes repetition queries O(k) over
+the reversible-move window instead of replaying the move stack.
+"""
+from __future__ import annotations
+
+import random
+
+import chess
+
+_rng = random.Random(0x5EED_C4E5)
+
+
+def _rand64() -> int:
+    return _rng.getrandbits(64)
+
+
+# piece_keys[color][piece_type][square]
+PIECE_KEYS = [
+    [[_rand64() for _ in chess.SQUARES] for _ in range(7)]  # index 0 unused
+    for _ in (chess.WHITE, chess.BLACK)
+]
+
+# One key per castling-rights rook square (A1, H1, A8, H8).
+CASTLING_KEYS = {
+    sq: _rand64() for sq in (chess.A1, chess.H1, chess.A8, chess.H8)
+}
+
+# One key per en-passant file. Only hashed when a legal en-passant capture
+# actually exists: a phantom ep square (set, but no capturer) leaves the same
+# position as its ep-less recurrence, and must hash identically for
+# repetition detection (matching Board._transposition_key()).
+EP_FILE_KEYS = [_rand64() for _ in range(8)]
+
+# XORed in when it is black's turn.
+TURN_KEY = _rand64()
+
+
+def piece_key(piece: chess.Piece, square: int) -> int:
+    return PIECE_KEYS[piece.color][piece.piece_type][square]
+
+
+def castling_key(castling_rights: int) -> int:
+    """Combined key for a castling-rights bitboard."""
+    key = 0
+    for sq, k in CASTLING_KEYS.items():
+        if castling_rights & chess.BB_SQUARES[sq]:
+            key ^= k
+    return key
+
+
+def hash_board(board: chess.Board) -> int:
+    """Full hash of a position; used to seed/verify the incremental hash."""
+    key = 0
+    for square, piece in board.piece_map().items():
+        key ^= piece_key(piece, square)
+    key ^= castling_key(board.castling_rights)
+    if board.has_legal_en_passant():
+        key ^= EP_FILE_KEYS[chess.square_file(board.ep_square)]
+    if board.turn == chess.BLACK:
+        key ^= TURN_KEY
+    return key
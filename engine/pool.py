@@ -0,0 +1,87 @@
+# engine/pool.py
+from __future__ import annotations
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+import chess.engine
+
+
+class EnginePool:
+    """
+    Fixed-size pool of long-lived UCI engines for one binary path.
+
+    Engines are spawned lazily up to 'size' and checked out per request via
+    acquire(), so concurrent searches run on separate processes instead of
+    serializing behind a single engine. If a call raises while an engine is
+    checked out, that instance is discarded (it may be wedged mid-search) and
+    its capacity slot is released, so a waiter blocked at the cap wakes and
+    spawns a fresh replacement instead of starving.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int = 3,
+        configure: Optional[Callable[[chess.engine.SimpleEngine], None]] = None,
+    ):
+        self.path = path
+        self.size = size
+        self._configure = configure
+        self._idle: queue.Queue = queue.Queue(maxsize=size)
+        # Capacity gate: one permit per live-or-spawnable engine. Discarding
+        # a wedged engine releases its permit, which is what unblocks waiters.
+        self._capacity = threading.Semaphore(size)
+
+    def _spawn(self) -> chess.engine.SimpleEngine:
+        eng = chess.engine.SimpleEngine.popen_uci(self.path)
+        if self._configure is not None:
+            try:
+                self._configure(eng)
+            except Exception:
+                pass
+        return eng
+
+    @contextmanager
+    def acquire(self):
+        """Check out an engine; returns it to the pool on clean exit."""
+        # Blocks here when all permits are checked out, until a holder either
+        # returns its engine or discards it.
+        self._capacity.acquire()
+        try:
+            try:
+                eng = self._idle.get_nowait()
+            except queue.Empty:
+                eng = self._spawn()
+        except Exception:
+            self._capacity.release()
+            raise
+
+        try:
+            yield eng
+        except Exception:
+            self._discard(eng)
+            raise
+        else:
+            self._idle.put(eng)
+            self._capacity.release()
+
+    def _discard(self, eng: chess.engine.SimpleEngine) -> None:
+        self._capacity.release()
+        try:
+            eng.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Quit every idle engine; checked-out engines die with their caller."""
+        while True:
+            try:
+                eng = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                eng.quit()
+            except Exception:
+                pass
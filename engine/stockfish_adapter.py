@@ -1,5 +1,8 @@
+import atexit
+import functools
 import os
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
@@ -7,34 +10,116 @@ import chess
 import chess.engine
 
 
+# ----------------------- Engine pooling -----------------------
+# Spawning Stockfish (fork + UCI handshake + NNUE load) per request costs far
+# more than a short search, so keep a small pool of long-lived engines per
+# path. Concurrent requests check out separate processes instead of queueing
+# behind one engine; a wedged engine is discarded and respawned by the pool.
+from engine.pool import EnginePool
+
+POOL_SIZE = 3
+
+_pools_lock = threading.Lock()
+_pools: Dict[str, EnginePool] = {}
+
+
+def _get_pool(path: str) -> EnginePool:
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = EnginePool(path, size=POOL_SIZE)
+            _pools[path] = pool
+        return pool
+
+
+# Stockfish's engine-default Skill Level (full strength).
+_DEFAULT_SKILL = 20
+
+
+def _configure_skill(eng: chess.engine.SimpleEngine, skill_level) -> None:
+    """Set Skill Level only when it differs from this engine's last value.
+
+    None means engine-default strength. Pooled engines outlive their callers,
+    so a level set for one request must be reset for the next rather than
+    leaking a weakened engine into full-strength searches.
+    """
+    level = _DEFAULT_SKILL if skill_level is None else int(skill_level)
+    if getattr(eng, "_skill_level", _DEFAULT_SKILL) == level:
+        return
+    try:
+        eng.configure({"Skill Level": level})
+        eng._skill_level = level
+    except Exception:
+        pass
+
+
+def _shutdown_engines() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(_shutdown_engines)
+
+
 def _pv_to_san_safe(board: chess.Board, pv_moves) -> list[str]:
     """
     Convert a PV (list of moves in either python-chess Move objects or UCI strings)
     into SAN moves safely. If a PV move is illegal for the current position,
     we stop and return whatever we have so far.
     """
-    tmp = board.copy()
-    san_list = []
+    moves: list[chess.Move] = []
     for mv in pv_moves:
         try:
             # Support both Move objects and UCI strings
-            move = mv if isinstance(mv, chess.Move) else chess.Move.from_uci(str(mv))
-            if move not in tmp.legal_moves:
-                break
-            san_list.append(tmp.san(move))
-            tmp.push(move)
+            moves.append(
+                mv if isinstance(mv, chess.Move) else chess.Move.from_uci(str(mv))
+            )
         except Exception:
-            # Any parsing or SAN issue: stop converting PV (don’t crash analysis)
+            break  # unparsable tail: convert what we have
+
+    # variation_san does the whole line in one pass; truncate from the end
+    # until the remaining prefix is legal (don’t crash analysis).
+    while moves:
+        try:
+            numbered = board.variation_san(moves)
             break
+        except Exception:
+            moves.pop()
+    else:
+        return []
+
+    # Strip move numbers: "1." tokens and the "1..." prefix glued to a
+    # black-to-move first SAN.
+    san_list = []
+    for tok in numbered.split():
+        if tok.endswith("."):
+            continue
+        if "..." in tok:
+            tok = tok.rsplit("...", 1)[-1]
+        san_list.append(tok)
     return san_list
 
 
+# Engine executable names recognised in the project-relative directories.
+_EXE_NAMES = frozenset(
+    ("stockfish.exe", "stockfish", "stockfish-windows-x86-64-avx2.exe")
+)
+
+
+@functools.lru_cache(maxsize=8)
 def find_engine_path(
     preferred: Optional[str] = None, strict: bool = False
 ) -> Optional[str]:
     """
     Try to find a Stockfish engine binary.
 
+    The result is memoized per (preferred, strict) so repeated calls don't
+    re-stat the filesystem; call refresh_engine_path() after installing or
+    moving an engine binary.
+
     If 'preferred' is provided:
       - if it exists, use it
       - if it does NOT exist and strict=True, return None (no fallback)
@@ -57,14 +142,17 @@ def find_engine_path(
     if env_path and Path(env_path).exists():
         return env_path
 
-    # 3) common relative dirs
+    # 3) common relative dirs: one scandir per directory instead of a stat
+    #    per candidate name
     here = Path(__file__).resolve().parents[1]  # project root (chess_app)
-    exe_names = ["stockfish.exe", "stockfish", "stockfish-windows-x86-64-avx2.exe"]
-    for d in ["engines", "engine", "bin"]:
-        for name in exe_names:
-            p = here / d / name
-            if p.exists():
-                return str(p)
+    for d in ("engines", "engine", "bin"):
+        try:
+            with os.scandir(here / d) as it:
+                for entry in it:
+                    if entry.name in _EXE_NAMES and entry.is_file():
+                        return entry.path
+        except (FileNotFoundError, NotADirectoryError):
+            continue
 
     # 4) PATH
     which = shutil.which("stockfish")
@@ -74,6 +162,11 @@ def find_engine_path(
     return None
 
 
+def refresh_engine_path() -> None:
+    """Forget memoized engine locations (e.g., after installing Stockfish)."""
+    find_engine_path.cache_clear()
+
+
 def probe_engine(preferred: Optional[str] = None) -> Dict[str, Any]:
     """
     Check if we can launch Stockfish. Never raises; returns:
@@ -115,7 +208,13 @@ def analyze_fen(
     movetime_ms: int = 300,
     depth: int | None = None,
     skill_level: int | None = None,
+    on_info=None,
 ) -> dict:
+    """
+    Analyze a position. If 'on_info' is given, it is called with a partial
+    dict ({depth, eval, pv}) for every info line the engine emits, so callers
+    can stream progress instead of blocking silently for the full movetime.
+    """
     path = find_engine_path()
     if not path:
         return {"ok": False, "error": "Stockfish not found"}
@@ -126,25 +225,55 @@ def analyze_fen(
         return {"ok": False, "error": f"Bad FEN: {e}"}
 
     try:
-        with chess.engine.SimpleEngine.popen_uci(path) as eng:
-            if skill_level is not None:
-                try:
-                    eng.configure({"Skill Level": int(skill_level)})
-                except Exception:
-                    pass
+        with _get_pool(path).acquire() as eng:
+            _configure_skill(eng, skill_level)
 
             limit = (
                 chess.engine.Limit(time=movetime_ms / 1000.0)
                 if movetime_ms
                 else chess.engine.Limit(depth=depth or 12)
             )
-            info = eng.analyse(board, limit)
-
-            # Bestmove via a short go
-            best = eng.play(
-                board, chess.engine.Limit(time=min(0.05, (movetime_ms or 300) / 1000.0))
-            )
-            bestmove = best.move.uci() if best and best.move else None
+            if on_info is not None:
+                # Streaming path: iterate the non-blocking analysis() feed so
+                # callers see PV/depth progress as it arrives.
+                info = {}
+                with eng.analysis(board, limit) as analysis:
+                    for partial in analysis:
+                        if "score" in partial or "pv" in partial:
+                            info = partial
+                            try:
+                                on_info(
+                                    {
+                                        "depth": partial.get("depth"),
+                                        "eval": _score_to_dict(
+                                            partial["score"], board
+                                        )
+                                        if "score" in partial
+                                        else None,
+                                        "pv": [
+                                            mv.uci()
+                                            for mv in partial.get("pv", [])
+                                        ],
+                                    }
+                                )
+                            except Exception:
+                                pass  # progress callbacks must never kill analysis
+                pv = info.get("pv", [])
+                bestmove = pv[0].uci() if pv else None
+            else:
+                # One fused search: play() with info= returns bestmove + score
+                # + pv, avoiding a second UCI "go" for the same position.
+                result = eng.play(
+                    board, limit, info=chess.engine.INFO_SCORE | chess.engine.INFO_PV
+                )
+                info = result.info
+                # pv[0] is the bestmove for the searched position; fall back
+                # to it if the engine reported no move.
+                if result.move is not None:
+                    bestmove = result.move.uci()
+                else:
+                    pv = info.get("pv", [])
+                    bestmove = pv[0].uci() if pv else None
 
             # Eval (pov to side-to-move already by python-chess)
             eval_cp = None
@@ -175,7 +304,7 @@ def analyze_fen(
                 "pv_san": pv_san,
             }
     except Exception as e:
-        # Never crash UI: return clean error
+        # Never crash UI: the pool already discarded the failed engine
         return {"ok": False, "error": str(e)}
 
 
@@ -195,19 +324,19 @@ def play_fen(
         return {"ok": False, "error": f"Bad FEN: {e}"}
 
     try:
-        with chess.engine.SimpleEngine.popen_uci(path) as eng:
-            if skill_level is not None:
-                try:
-                    eng.configure({"Skill Level": int(skill_level)})
-                except Exception:
-                    pass
+        with _get_pool(path).acquire() as eng:
+            _configure_skill(eng, skill_level)
 
             limit = (
                 chess.engine.Limit(time=movetime_ms / 1000.0)
                 if movetime_ms
                 else chess.engine.Limit(depth=depth or 12)
             )
-            result = eng.play(board, limit)
+            # One fused search: the same "go" yields the move plus score/pv,
+            # so no follow-up analyse is needed.
+            result = eng.play(
+                board, limit, info=chess.engine.INFO_SCORE | chess.engine.INFO_PV
+            )
             if not result or not result.move:
                 return {"ok": False, "error": "Engine did not return a move"}
 
@@ -218,13 +347,8 @@ def play_fen(
                     "error": f"Engine move illegal in this position: {result.move.uci()}",
                 }
 
-            # Make the move
-            board.push(result.move)
-
-            # Optional brief analysis after the move for PV/eval
-            info = eng.analyse(
-                board, chess.engine.Limit(time=min(0.05, (movetime_ms or 300) / 1000.0))
-            )
+            # Eval/PV come from the pre-move search (mover's POV)
+            info = result.info
             eval_cp = None
             eval_mate = None
             if "score" in info:
@@ -235,6 +359,9 @@ def play_fen(
                     eval_cp = score.score(mate_score=32000)
             pv_san = _pv_to_san_safe(board, info.get("pv", []))
 
+            # Make the move
+            board.push(result.move)
+
             return {
                 "ok": True,
                 "move": result.move.uci(),
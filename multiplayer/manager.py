@@ -1,15 +1,42 @@
 # multiplayer/manager.py
 from __future__ import annotations
 import secrets
+from dataclasses import dataclass
 from typing import Dict, Optional
 
 from chess_core.game import ChessGame
-from chess_core.clocks import ChessClocks
+from chess_core.clocks import ChessClocks, _now_ms
+
+# Idle empty rooms are swept after this long without activity.
+ROOM_TTL_MS = 60 * 60_000  # 1 hour
+
+
+# Room-code alphabet: no ambiguous 0/O/1/I, 5 bits of entropy per char.
+_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
 
 
 def _room_code() -> str:
-    # 6-char URL-safe code
-    return secrets.token_urlsafe(4).replace("-", "").replace("_", "")[:6].upper()
+    # 6-char code sampled directly; no token scrubbing/truncation passes
+    return "".join(secrets.choice(_CODE_ALPHABET) for _ in range(6))
+
+
+@dataclass(slots=True)
+class RoomState:
+    """Per-event room snapshot: fixed slotted fields instead of an ad-hoc
+    dict, so the highest-frequency payload in multiplayer is built without
+    hashing keys or growing a dict."""
+
+    fen: str
+    status: str
+    flags: dict
+    clocks: dict
+
+    _KEYS = ("fen", "status", "flags", "clocks")
+
+    def to_dict(self) -> dict:
+        # Hand-rolled like ClockState.to_dict: asdict() deep-copies through
+        # field reflection, which is wasteful for a flat snapshot.
+        return dict(zip(self._KEYS, (self.fen, self.status, self.flags, self.clocks)))
 
 
 class Room:
@@ -18,27 +45,69 @@ class Room:
         self.clocks = ChessClocks(base_ms=minutes * 60_000, inc_ms=inc * 1000, turn="w")
         self.players: Dict[str, Optional[str]] = {"w": None, "b": None}  # sid map
         self.spectators: set[str] = set()
+        self.last_activity_ms = _now_ms()
+        # Position-derived half of to_state(), cached per position: only the
+        # live clock snapshot changes between moves.
+        self._state_base: Optional[tuple] = None
+
+    def touch(self) -> None:
+        self.last_activity_ms = _now_ms()
 
-    def to_state(self):
-        return {
-            "fen": self.game.get_fen(),
-            "status": self.game.game_status(),
-            "flags": self.game.status_flags(),
-            "clocks": self.clocks.snapshot(),
-        }
+    def is_empty(self) -> bool:
+        return (
+            self.players["w"] is None
+            and self.players["b"] is None
+            and not self.spectators
+        )
+
+    def to_state(self) -> RoomState:
+        # State goes out to every subscriber on every event; rebuild the
+        # position half only when the position actually changed. Only the
+        # clock snapshot is fresh per call.
+        key = self.game._status_key()
+        base = self._state_base
+        if base is None or base[0] != key:
+            base = (
+                key,
+                self.game.get_fen(),
+                self.game.game_status(),
+                self.game.status_flags(),
+            )
+            self._state_base = base
+        return RoomState(
+            fen=base[1],
+            status=base[2],
+            flags=base[3],
+            clocks=self.clocks.snapshot(),
+        )
 
 
 class GameManager:
     def __init__(self):
         self.rooms: Dict[str, Room] = {}
+        # Reverse index sid -> (room code, role): disconnects resolve in O(1)
+        # instead of scanning every room for the sid.
+        self.sid_index: Dict[str, tuple[str, str]] = {}
 
     def create_room(self, minutes: int = 5, inc: int = 0) -> str:
+        self._sweep_idle_rooms()
         code = _room_code()
         while code in self.rooms:
             code = _room_code()
         self.rooms[code] = Room(minutes=minutes, inc=inc)
         return code
 
+    def _sweep_idle_rooms(self) -> None:
+        """Drop empty rooms idle past the TTL so memory stays bounded."""
+        now = _now_ms()
+        stale = [
+            code
+            for code, r in self.rooms.items()
+            if r.is_empty() and now - r.last_activity_ms > ROOM_TTL_MS
+        ]
+        for code in stale:
+            del self.rooms[code]
+
     def get(self, code: str) -> Optional[Room]:
         return self.rooms.get(code)
 
@@ -46,6 +115,7 @@ class GameManager:
         r = self.rooms.get(code)
         if not r:
             return {"ok": False, "error": "Room not found"}
+        r.touch()
         color = None
         if r.players["w"] is None:
             r.players["w"] = sid
@@ -56,14 +126,29 @@ class GameManager:
         else:
             r.spectators.add(sid)
             color = "s"
-        return {"ok": True, "color": color, "state": r.to_state()}
+        self.sid_index[sid] = (code, color)
+        return {"ok": True, "color": color, "state": r.to_state().to_dict()}
 
     def leave(self, code: str, sid: str) -> None:
         r = self.rooms.get(code)
         if not r:
             return
+        r.touch()
+        self.sid_index.pop(sid, None)
         for c in ("w", "b"):
             if r.players[c] == sid:
                 r.players[c] = None
         r.spectators.discard(sid)
-        # keep room alive; we could gc empty rooms later
+        # room stays alive until the TTL sweep collects it
+
+    def disconnect(self, sid: str) -> Optional[str]:
+        """Drop a sid from whatever room it occupies; returns the room code.
+
+        O(1) via the reverse index — no scan over rooms.
+        """
+        entry = self.sid_index.get(sid)
+        if entry is None:
+            return None
+        code, _role = entry
+        self.leave(code, sid)
+        return code
@@ -1,13 +1,23 @@
 # review/reviewer.py
 from __future__ import annotations
+import concurrent.futures
 import io
+import os
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Any, Optional, Tuple
 
 import chess
+import chess.engine
 import chess.pgn
 
-from engine.stockfish_adapter import analyze_fen
+# numpy lets us score a whole game's cp losses in one vectorized pass; fall
+# back to the scalar helper when it isn't installed.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from engine.stockfish_adapter import find_engine_path
 
 
 # ---- Tunable thresholds (centipawns) ----
@@ -73,6 +83,13 @@ def _classify(
     return "Good"
 
 
+# Bin edges / score lookup shared by the vectorized accuracy pass; keep in
+# sync with _score_from_cp_loss below.
+if np is not None:
+    _SCORE_BINS = np.array([0, 50, 100, 200, 300, 500], dtype=np.int32)
+    _SCORE_LUT = np.array([1.0, 0.9, 0.8, 0.65, 0.5, 0.3, 0.2])
+
+
 def _score_from_cp_loss(cp_loss: Optional[int]) -> float:
     """
     Convert cp loss to 0..1 score for accuracy.
@@ -110,99 +127,346 @@ def _pov_cp(score: Optional[int], side_to_move_is_white: bool) -> Optional[int]:
     return score
 
 
+def _build_move_review(
+    ply: int,
+    mv: chess.Move,
+    san: str,
+    side: str,
+    eval_before: Optional[Dict[str, Any]],
+    eval_after: Optional[Dict[str, Any]],
+    best_before_uci: Optional[str],
+    pv_san_before: List[str],
+) -> MoveReview:
+    # Compute cp loss from mover's perspective:
+    # before: eval from mover POV at pre-move
+    # after:  eval is from side-to-move (opponent) POV; invert to mover POV
+    cp_before = _pov_cp(
+        _cp_from_eval(eval_before), side_to_move_is_white=(side == "White")
+    )
+    cp_after_raw = _cp_from_eval(eval_after)
+    cp_after_for_mover = -cp_after_raw if cp_after_raw is not None else None
+
+    cp_loss: Optional[int] = None
+    if (cp_before is not None) and (cp_after_for_mover is not None):
+        cp_loss = cp_before - cp_after_for_mover
+
+    verdict = _classify(cp_loss, eval_before, eval_after)
+
+    return MoveReview(
+        ply=ply,
+        move_uci=mv.uci(),
+        move_san=san,
+        side=side,
+        cp_loss=cp_loss,
+        verdict=verdict,
+        eval_before=eval_before,
+        eval_after=eval_after,
+        bestmove_uci=best_before_uci,
+        pv_san=pv_san_before,
+    )
+
+
+def _eval_from_info(info: Dict[str, Any], board: chess.Board) -> Dict[str, Any]:
+    """Score dict ({'type': 'cp'|'mate', 'value': ...}) from an engine InfoDict."""
+    score = info.get("score")
+    if score is None:
+        return {"type": "cp", "value": None}
+    pov = score.pov(board.turn)
+    if pov.is_mate():
+        return {"type": "mate", "value": pov.mate()}
+    return {"type": "cp", "value": pov.score(mate_score=32000)}
+
+
+def _carry_eval_across_move(eval_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-express a pre-move eval of the played line from the post-move
+    side-to-move's point of view.
+
+    cp scores just negate. Mate distances don't: a winning mate-in-N spends
+    one of the mover's own mating moves, so after the push the defender
+    faces mate in N-1 (negated); a losing distance is untouched by the
+    mover's reply and only flips sign.
+    """
+    value = eval_obj.get("value")
+    if value is None:
+        return {"type": eval_obj.get("type", "cp"), "value": None}
+    if eval_obj.get("type") == "mate":
+        return {"type": "mate", "value": -(value - 1) if value > 0 else -value}
+    return {"type": "cp", "value": -value}
+
+
+def _pv_san_from_info(info: Dict[str, Any], board: chess.Board) -> List[str]:
+    pv = info.get("pv", [])
+    try:
+        tmp = board.copy()
+        out = []
+        for mv in pv:
+            out.append(tmp.san(mv))
+            tmp.push(mv)
+        return out
+    except Exception:
+        return []
+
+
+def _review_limits(
+    movetime_ms: int, depth: Optional[int]
+) -> Tuple[chess.engine.Limit, chess.engine.Limit]:
+    """Main search limit plus the shorter fallback-search limit."""
+    if depth is not None:
+        limit = chess.engine.Limit(depth=depth)
+        return limit, limit
+    return (
+        chess.engine.Limit(time=movetime_ms / 1000.0),
+        chess.engine.Limit(time=movetime_ms / 2000.0),
+    )
+
+
+def _analyse_move(
+    eng: chess.engine.SimpleEngine,
+    board: chess.Board,
+    mv: chess.Move,
+    limit: chess.engine.Limit,
+    fallback_limit: chess.engine.Limit,
+) -> Tuple[Dict[str, Any], Optional[str], List[str], Dict[str, Any]]:
+    """
+    Analyze one ply with a MultiPV=2 search; pushes mv onto board.
+    Returns (eval_before, best_before_uci, pv_san_before, eval_after).
+    """
+    # One MultiPV=2 search on the pre-move position covers both the best
+    # line and (usually) the played move's line.
+    infos = eng.analyse(board, limit, multipv=2)
+    top = infos[0] if infos else {}
+    eval_before = _eval_from_info(top, board)
+    pv_before = top.get("pv", [])
+    best_before_uci = pv_before[0].uci() if pv_before else None
+    pv_san_before = _pv_san_from_info(top, board)
+
+    played_entry = None
+    for entry in infos:
+        epv = entry.get("pv")
+        if epv and epv[0] == mv:
+            played_entry = entry
+            break
+
+    eval_played = (
+        _eval_from_info(played_entry, board) if played_entry is not None else None
+    )
+    board.push(mv)
+
+    if eval_played is not None:
+        # The pre-move search already scored the played move (mover POV);
+        # re-express it from the post-move side-to-move POV.
+        eval_after = _carry_eval_across_move(eval_played)
+    elif board.is_game_over(claim_draw=True):
+        # Terminal position: no point paying a search with no legal moves.
+        eval_after = (
+            {"type": "mate", "value": 0}
+            if board.is_checkmate()
+            else {"type": "cp", "value": 0}
+        )
+    else:
+        # Played move outside the top-2: short search after it.
+        info_after = eng.analyse(board, fallback_limit)
+        eval_after = _eval_from_info(info_after, board)
+
+    return eval_before, best_before_uci, pv_san_before, eval_after
+
+
+# ---- Cross-run analysis cache ----
+# Repeated reviews (and shared opening prefixes between games) hit the same
+# positions; memoize per (position, move, search budget) so those plies skip
+# the engine entirely. Keyed on python-chess's transposition key
+# (occupied/turn/castling/ep) rather than a FEN prefix: no string building,
+# and transposed move orders within a game dedup to the same entry.
+_ANALYSIS_CACHE: Dict[tuple, tuple] = {}
+_ANALYSIS_CACHE_MAX = 50_000
+
+
+def _analysis_key(
+    board: chess.Board,
+    mv: chess.Move,
+    movetime_ms: int,
+    depth: Optional[int],
+    skill_level: Optional[int],
+) -> tuple:
+    return (board._transposition_key(), mv.uci(), movetime_ms, depth, skill_level)
+
+
+def _analyse_move_cached(
+    eng: chess.engine.SimpleEngine,
+    board: chess.Board,
+    mv: chess.Move,
+    limit: chess.engine.Limit,
+    fallback_limit: chess.engine.Limit,
+    key: tuple,
+) -> Tuple[Dict[str, Any], Optional[str], List[str], Dict[str, Any]]:
+    """Cached _analyse_move; still pushes mv onto board on a hit."""
+    hit = _ANALYSIS_CACHE.get(key)
+    if hit is not None:
+        board.push(mv)
+        return hit
+    vals = _analyse_move(eng, board, mv, limit, fallback_limit)
+    if len(_ANALYSIS_CACHE) >= _ANALYSIS_CACHE_MAX:
+        _ANALYSIS_CACHE.pop(next(iter(_ANALYSIS_CACHE)))
+    _ANALYSIS_CACHE[key] = vals
+    return vals
+
+
+# ---- Process-pool workers (one persistent engine per worker process) ----
+_WORKER_ENGINE: Optional[chess.engine.SimpleEngine] = None
+
+
+def _review_worker(args: Tuple[str, str, int, Optional[int], Optional[int]]) -> dict:
+    """Analyze one (fen, played move) pair in a pool worker process."""
+    global _WORKER_ENGINE
+    fen, uci, movetime_ms, depth, skill_level = args
+    try:
+        if _WORKER_ENGINE is None:
+            path = find_engine_path()
+            if not path:
+                return {"ok": False, "error": "Stockfish not found"}
+            _WORKER_ENGINE = chess.engine.SimpleEngine.popen_uci(path)
+            try:
+                options = {"Hash": 64, "Threads": 1}
+                if skill_level is not None:
+                    options["Skill Level"] = int(skill_level)
+                _WORKER_ENGINE.configure(options)
+            except Exception:
+                pass
+        board = chess.Board(fen)
+        mv = chess.Move.from_uci(uci)
+        limit, fallback_limit = _review_limits(movetime_ms, depth)
+        key = _analysis_key(board, mv, movetime_ms, depth, skill_level)
+        eval_before, best_uci, pv_san, eval_after = _analyse_move_cached(
+            _WORKER_ENGINE, board, mv, limit, fallback_limit, key
+        )
+        return {
+            "ok": True,
+            "eval_before": eval_before,
+            "bestmove_uci": best_uci,
+            "pv_san": pv_san,
+            "eval_after": eval_after,
+            "engine": _WORKER_ENGINE.id.get("name", "Stockfish"),
+        }
+    except Exception as e:
+        return {"ok": False, "error": str(e) or "Engine unavailable"}
+
+
 def review_pgn(
     pgn_text: str,
     movetime_ms: int = 200,
     depth: Optional[int] = None,
     skill_level: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> ReviewSummary:
     # Parse PGN
     game = chess.pgn.read_game(io.StringIO(pgn_text))
     if game is None:
         return ReviewSummary([], {}, None, None, ok=False, error="Could not parse PGN")
 
-    board = game.board()
+    path = find_engine_path()
+    if not path:
+        return ReviewSummary(
+            [], {}, None, None, ok=False, error="Stockfish not found"
+        )
+
     moves_data: List[MoveReview] = []
     engine_name: Optional[str] = None
-
-    ply = 0
-    for mv in game.mainline_moves():
-        ply += 1
-        side = "White" if board.turn else "Black"
-
-        # Analyze BEFORE the move
-        a_before = analyze_fen(
-            fen=board.fen(),
-            movetime_ms=movetime_ms,
-            depth=depth,
-            skill_level=skill_level,
+    limit, fallback_limit = _review_limits(movetime_ms, depth)
+
+    # Precompute the mainline once into flat records before any engine work:
+    # the engine loops below stay tight instead of interleaving SAN
+    # bookkeeping with searches. No FENs here — python-chess sends the board
+    # to the engine as incremental moves, so the sequential path never
+    # serializes a position to a string.
+    records = []  # (ply, side, san, mv)
+    board = game.board()
+    for node in game.mainline():
+        mv = node.move
+        records.append(
+            (
+                len(records) + 1,
+                "White" if board.turn else "Black",
+                board.san(mv),
+                mv,
+            )
         )
-        if not a_before.get("ok"):
-            # Engine unavailable or error -> graceful return with partial/no data
+        board.push(mv)
+
+    if workers and workers > 1:
+        # Fan the independent per-ply analyses out to a pool of engine
+        # worker processes (each owning its own persistent Stockfish).
+        # Positions cross the process boundary as FENs, built only on this
+        # branch.
+        tasks = []
+        b = game.board()
+        for _, _, _, mv in records:
+            tasks.append((b.fen(), mv.uci(), movetime_ms, depth, skill_level))
+            b.push(mv)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(workers, os.cpu_count() or 1)
+            ) as pool:
+                results = list(pool.map(_review_worker, tasks))
+        except Exception as e:
             return ReviewSummary(
-                moves=[],
-                counts={},
-                accuracy_percent=None,
-                engine=None,
-                ok=False,
-                error=a_before.get("error") or "Engine unavailable",
+                [], {}, None, None, ok=False, error=str(e) or "Pool failed"
             )
-        engine_name = a_before["engine"]["version"]
-        eval_before = a_before.get("eval")
-        best_before_uci = a_before.get("bestmove")
-        pv_san_before = a_before.get("pv_san", [])
 
-        # Apply actual move
-        san = board.san(mv)
-        board.push(mv)
-
-        # Analyze AFTER the move
-        a_after = analyze_fen(
-            fen=board.fen(),
-            movetime_ms=movetime_ms,
-            depth=depth,
-            skill_level=skill_level,
-        )
-        if not a_after.get("ok"):
+        for (ply, side, san, mv), res in zip(records, results):
+            if not res.get("ok"):
+                return ReviewSummary(
+                    [], {}, None, None,
+                    ok=False,
+                    error=res.get("error") or "Engine unavailable",
+                )
+            engine_name = res.get("engine") or engine_name
+            moves_data.append(
+                _build_move_review(
+                    ply, mv, san, side,
+                    res["eval_before"], res["eval_after"],
+                    res["bestmove_uci"], res["pv_san"],
+                )
+            )
+    else:
+        try:
+            # One engine session for the whole game: no per-ply process
+            # spawn, and Stockfish's transposition table stays hot across
+            # plies: each search starts from the subtree the previous ply
+            # already explored, so successive positions converge much faster
+            # than cold searches. A generous Hash keeps eviction minimal over
+            # a full game.
+            with chess.engine.SimpleEngine.popen_uci(path) as eng:
+                try:
+                    options = {"Hash": 256, "Threads": 1}
+                    if skill_level is not None:
+                        options["Skill Level"] = int(skill_level)
+                    eng.configure(options)
+                except Exception:
+                    pass
+                engine_name = eng.id.get("name", "Stockfish")
+
+                board = game.board()
+                for ply, side, san, mv in records:
+                    key = _analysis_key(board, mv, movetime_ms, depth, skill_level)
+                    eval_before, best_uci, pv_san, eval_after = _analyse_move_cached(
+                        eng, board, mv, limit, fallback_limit, key
+                    )
+                    moves_data.append(
+                        _build_move_review(
+                            ply, mv, san, side,
+                            eval_before, eval_after,
+                            best_uci, pv_san,
+                        )
+                    )
+        except Exception as e:
             return ReviewSummary(
                 moves=[],
                 counts={},
                 accuracy_percent=None,
                 engine=None,
                 ok=False,
-                error=a_after.get("error") or "Engine unavailable",
-            )
-        eval_after = a_after.get("eval")
-
-        # Compute cp loss from mover's perspective:
-        # before: eval from mover POV at pre-move
-        # after:  eval is from side-to-move (opponent) POV; invert to mover POV
-        cp_before = _pov_cp(
-            _cp_from_eval(eval_before), side_to_move_is_white=(side == "White")
-        )
-        cp_after_raw = _cp_from_eval(eval_after)
-        cp_after_for_mover = -cp_after_raw if cp_after_raw is not None else None
-
-        cp_loss: Optional[int] = None
-        if (cp_before is not None) and (cp_after_for_mover is not None):
-            cp_loss = cp_before - cp_after_for_mover
-
-        verdict = _classify(cp_loss, eval_before, eval_after)
-
-        moves_data.append(
-            MoveReview(
-                ply=ply,
-                move_uci=mv.uci(),
-                move_san=san,
-                side=side,
-                cp_loss=cp_loss,
-                verdict=verdict,
-                eval_before=eval_before,
-                eval_after=eval_after,
-                bestmove_uci=best_before_uci,
-                pv_san=pv_san_before,
+                error=str(e) or "Engine unavailable",
             )
-        )
 
     # Summaries
     counts = {
@@ -228,8 +492,21 @@ def review_pgn(
 
     # Accuracy: average of side-to-move scores
     if moves_data:
-        scores = [_score_from_cp_loss(m.cp_loss) for m in moves_data]
-        accuracy = round(sum(scores) / len(scores) * 100.0, 1)
+        if np is not None:
+            # One digitize pass over the whole game instead of a per-move
+            # if-ladder; unknown losses map to 50 (the 0.9 bucket), matching
+            # _score_from_cp_loss(None).
+            losses = np.abs(
+                np.array(
+                    [m.cp_loss if m.cp_loss is not None else 50 for m in moves_data],
+                    dtype=np.int32,
+                )
+            )
+            idx = np.digitize(losses, _SCORE_BINS, right=True)
+            accuracy = round(float(_SCORE_LUT[idx].mean()) * 100.0, 1)
+        else:
+            scores = [_score_from_cp_loss(m.cp_loss) for m in moves_data]
+            accuracy = round(sum(scores) / len(scores) * 100.0, 1)
     else:
         accuracy = None
 
@@ -243,36 +520,36 @@ def review_pgn(
     )
 
 
+def _fmt_eval(e) -> str:
+    if not e:
+        return ""
+    if e["type"] == "mate":
+        return f"Mate in {e['value']}"
+    if e["type"] == "cp" and e["value"] is not None:
+        return f"{e['value']/100:.2f}"
+    return ""
+
+
+def _report_row(m: MoveReview) -> str:
+    return (
+        f"<tr>"
+        f"<td>{m.ply}</td>"
+        f"<td>{m.side}</td>"
+        f"<td><code>{m.move_san}</code> <small>({m.move_uci})</small></td>"
+        f"<td>{_fmt_eval(m.eval_before)}</td>"
+        f"<td>{_fmt_eval(m.eval_after)}</td>"
+        f"<td>{'' if m.cp_loss is None else m.cp_loss}</td>"
+        f"<td><b>{m.verdict}</b></td>"
+        f"<td><small>{' '.join(m.pv_san[:6])}</small></td>"
+        f"</tr>"
+    )
+
+
 def render_html_report(summary: ReviewSummary, title: str = "Game Review") -> str:
     if not summary.ok:
         return f"<h3>{title}</h3><p style='color:red'>Error: {summary.error}</p>"
 
-    rows = []
-    for m in summary.moves:
-        eval_b = m.eval_before
-        eval_a = m.eval_after
-
-        def fmt_eval(e):
-            if not e:
-                return ""
-            if e["type"] == "mate":
-                return f"Mate in {e['value']}"
-            if e["type"] == "cp" and e["value"] is not None:
-                return f"{e['value']/100:.2f}"
-            return ""
-
-        rows.append(
-            f"<tr>"
-            f"<td>{m.ply}</td>"
-            f"<td>{m.side}</td>"
-            f"<td><code>{m.move_san}</code> <small>({m.move_uci})</small></td>"
-            f"<td>{fmt_eval(eval_b)}</td>"
-            f"<td>{fmt_eval(eval_a)}</td>"
-            f"<td>{'' if m.cp_loss is None else m.cp_loss}</td>"
-            f"<td><b>{m.verdict}</b></td>"
-            f"<td><small>{' '.join(m.pv_san[:6])}</small></td>"
-            f"</tr>"
-        )
+    body = "".join(_report_row(m) for m in summary.moves)
     counts_str = " • ".join([f"{k}: {v}" for k, v in summary.counts.items()])
     engine_str = summary.engine or "(unknown engine)"
     acc_str = (
@@ -295,7 +572,7 @@ def render_html_report(summary: ReviewSummary, title: str = "Game Review") -> st
             </tr>
           </thead>
           <tbody>
-            {''.join(rows)}
+            {body}
           </tbody>
         </table>
       </div>
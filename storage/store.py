@@ -1,32 +1,99 @@
 # storage/store.py
 from __future__ import annotations
 import json
+import sqlite3
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
-DATA_FILE = Path(__file__).resolve().parent / "games.json"
+# orjson is a C-extension encoder several times faster than stdlib json;
+# fall back gracefully when it isn't installed.
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _json_loads(raw) -> Any:
+        return orjson.loads(raw)
+
+except ImportError:
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    def _json_loads(raw) -> Any:
+        return json.loads(raw)
+
+
+# msgpack, when available, packs the clocks' numeric fields as binary ints
+# instead of ASCII digits — smaller blobs, ~2x faster encode/decode than
+# JSON. Rows written before the switch still load via the JSON fallback
+# (JSON text is never a valid single msgpack object).
+try:
+    import msgpack
+
+    def _dumps(obj: Any) -> bytes:
+        return msgpack.packb(obj)
+
+    def _loads(raw) -> Any:
+        try:
+            return msgpack.unpackb(raw)
+        except Exception:
+            return _json_loads(raw)
+
+except ImportError:
+    _dumps = _json_dumps
+    _loads = _json_loads
+
+# SQLite key-value store: saves rewrite one row instead of re-reading and
+# rewriting the whole JSON file, and WAL mode keeps concurrent writers safe.
+DATA_FILE = Path(__file__).resolve().parent / "games.db"
 DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+_conn: sqlite3.Connection | None = None
+_lock = threading.Lock()
 
-def _read() -> Dict[str, Any]:
-    if not DATA_FILE.exists():
-        return {}
-    try:
-        return json.loads(DATA_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+# In-process mirror of saved states: reads of recently saved rooms never
+# touch SQLite or re-parse JSON.
+_cache: Dict[str, Dict[str, Any]] = {}
 
 
-def _write(obj: Dict[str, Any]) -> None:
-    DATA_FILE.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(
+            DATA_FILE, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rooms ("
+            "code TEXT PRIMARY KEY, state BLOB NOT NULL)"
+        )
+        _conn = conn
+    return _conn
 
 
 def save_room_state(code: str, state: Dict[str, Any]) -> None:
-    db = _read()
-    db[code] = state
-    _write(db)
+    with _lock:
+        _cache[code] = state
+        _connect().execute(
+            "INSERT OR REPLACE INTO rooms (code, state) VALUES (?, ?)",
+            (code, _dumps(state)),
+        )
 
 
 def load_room_state(code: str) -> Dict[str, Any] | None:
-    db = _read()
-    return db.get(code)
+    with _lock:
+        state = _cache.get(code)
+        if state is not None:
+            return state
+        row = _connect().execute(
+            "SELECT state FROM rooms WHERE code = ?", (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        state = _loads(row[0])
+        _cache[code] = state
+        return state
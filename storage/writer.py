@@ -0,0 +1,64 @@
+# storage/writer.py
+from __future__ import annotations
+import atexit
+import queue
+import threading
+from typing import Any, Dict
+
+from storage.store import save_room_state
+
+# Background persistence for room snapshots: callers enqueue and move on, so
+# the disk write never sits between a move and the state echo players are
+# waiting for. Rapid updates for one room coalesce — _pending holds only the
+# newest snapshot per code, and the queue carries "this code has work" tokens
+# drained FIFO by a single writer thread (per-room write order is preserved).
+_pending: Dict[str, Dict[str, Any]] = {}
+_pending_lock = threading.Lock()
+_q: queue.Queue = queue.Queue()
+
+_writer_started = False
+_writer_lock = threading.Lock()
+
+
+def _drain() -> None:
+    while True:
+        code = _q.get()
+        with _pending_lock:
+            state = _pending.pop(code, None)
+        if state is not None:
+            try:
+                save_room_state(code, state)
+            except Exception:
+                pass  # persistence must never kill the writer thread
+        _q.task_done()
+
+
+def _ensure_writer() -> None:
+    global _writer_started
+    if _writer_started:
+        return
+    with _writer_lock:
+        if not _writer_started:
+            threading.Thread(
+                target=_drain, name="room-state-writer", daemon=True
+            ).start()
+            _writer_started = True
+
+
+def enqueue(code: str, state: Dict[str, Any]) -> None:
+    """Queue a room snapshot for background persistence (newest wins)."""
+    _ensure_writer()
+    with _pending_lock:
+        fresh = code not in _pending
+        _pending[code] = state
+    if fresh:
+        _q.put(code)
+
+
+def flush() -> None:
+    """Block until every queued snapshot is written (shutdown/tests)."""
+    if _writer_started:
+        _q.join()
+
+
+atexit.register(flush)
@@ -16,6 +16,53 @@ def test_illegal_move():
     assert game.push_move("e2e5") is False
 
 
+def test_incremental_hash_matches_full_rehash():
+    from chess_core import zobrist
+
+    game = ChessGame()
+    # Exercise captures, castling, en passant and promotion-free play.
+    for uci in [
+        "e2e4", "d7d5", "e4d5", "g8f6", "g1f3", "f6d5",
+        "f1c4", "e7e6", "e1g1", "f8e7", "d2d4", "e8g8",
+    ]:
+        assert game.push_move(uci) is True
+        assert game._zobrist == zobrist.hash_board(game.board)
+
+
+def test_threefold_detection():
+    game = ChessGame()
+    # Shuffle knights back and forth to repeat the start position twice more.
+    for uci in [
+        "g1f3", "g8f6", "f3g1", "f6g8",
+        "g1f3", "g8f6", "f3g1", "f6g8",
+    ]:
+        game.push_move(uci)
+    assert game.is_threefold() is True
+
+
+def test_phantom_ep_does_not_block_repetition():
+    game = ChessGame()
+    # e4 sets an ep square no black pawn can capture on; the knight shuffle
+    # then recreates the position without it. Both must hash the same or the
+    # repetition count stalls at two.
+    for uci in [
+        "e2e4",
+        "g8f6", "g1f3", "f6g8", "f3g1",
+        "g8f6", "g1f3", "f6g8", "f3g1",
+    ]:
+        assert game.push_move(uci) is True
+    assert game.board.is_repetition(3) is True
+    assert game.is_threefold() is True
+
+
+def test_san_move_list_tracks_pushes():
+    game = ChessGame()
+    game.push_move("e2e4")
+    game.push_move("e7e5")
+    game.push_move("g1f3")
+    assert game.san_move_list() == ["e4", "e5", "Nf3"]
+
+
 import pytest
 from chess_core.game import ChessGame
 
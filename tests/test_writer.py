@@ -0,0 +1,36 @@
+import threading
+
+import storage.writer as writer
+
+
+def test_rapid_enqueues_coalesce_to_newest(monkeypatch):
+    saved = []
+    gate = threading.Event()
+
+    def fake_save(code, state):
+        if code == "GATE":
+            # Hold the writer thread here so the updates below land in
+            # _pending before it gets to drain them.
+            gate.wait(timeout=2)
+        saved.append((code, state))
+
+    monkeypatch.setattr(writer, "save_room_state", fake_save)
+
+    writer.enqueue("GATE", {})
+    writer.enqueue("ROOM01", {"v": 1})
+    writer.enqueue("ROOM01", {"v": 2})
+    gate.set()
+    writer.flush()
+
+    room_saves = [state for code, state in saved if code == "ROOM01"]
+    assert room_saves == [{"v": 2}]  # newest wins; the stale snapshot never hits disk
+
+
+def test_flush_persists_pending_states(monkeypatch):
+    saved = {}
+    monkeypatch.setattr(writer, "save_room_state", saved.__setitem__)
+
+    writer.enqueue("ROOM02", {"fen": "x"})
+    writer.flush()
+
+    assert saved["ROOM02"] == {"fen": "x"}
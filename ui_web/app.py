@@ -1,13 +1,31 @@
 # ui_web/app.py
+import hashlib
+import json
 import os
+import re
+import tempfile
 import sys
 import time
 import io
 import datetime as dt
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from uuid import uuid4
 from typing import Optional, Dict, Any, List
 
-from flask import Flask, render_template, request, jsonify, Response
+from collections import OrderedDict
+
+from flask import (
+    Flask,
+    render_template,
+    request,
+    jsonify,
+    Response,
+    session,
+    stream_with_context,
+)
+from jinja2 import FileSystemBytecodeCache
 
 # ---------- ensure project root is importable ----------
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -18,9 +36,32 @@ if PROJECT_ROOT not in sys.path:
 # --- Flask app (explicit folders) ---
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
+# Persist compiled template bytecode across processes: a cold start unpickles
+# templates instead of recompiling them. Reload-on-change still follows
+# app.debug (Flask's default), so production renders skip the per-call stat.
+_JINJA_CACHE_DIR = os.path.join(tempfile.gettempdir(), "chess_app_jinja_cache")
+os.makedirs(_JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(_JINJA_CACHE_DIR)
+
+# orjson-backed JSON provider: every jsonify()/get_json() in the app goes
+# through the C encoder instead of stdlib json. Optional, like elsewhere in
+# the project — stdlib remains the fallback.
+try:
+    import orjson
+    from flask.json.provider import DefaultJSONProvider
+
+    class _ORJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = _ORJSONProvider(app)
+except ImportError:
+    orjson = None
+
 # --- chess core ---
-import chess
-import chess.pgn
 from chess_core.game import ChessGame  # your existing class
 
 # --- optional engine + review modules (fail-safe if missing) ---
@@ -58,120 +99,161 @@ except Exception:
         return "<div style='color:#e11d48'>Reviewer unavailable.</div>"
 
 
-# ----------------- Global single-game state (simple MVP) -----------------
-game = ChessGame()
-
-
 # ----------------- Simple chess clocks -----------------
 @dataclass
 class Clocks:
-    w_ms: int = 5 * 60 * 1000
-    b_ms: int = 5 * 60 * 1000
+    # Remaining time indexed by side: ms[0] = white, ms[1] = black. Indexing
+    # by the ticking side keeps the update path branch-free.
+    ms: List[int] = field(default_factory=lambda: [5 * 60 * 1000, 5 * 60 * 1000])
     increment: int = 0  # per-move increment, ms
     running: bool = False
-    turn: str = "w"  # 'w' or 'b' (whose clock is ticking)
-    last_ts: Optional[float] = None  # time.time() when we last started
+    i: int = 0  # whose clock is ticking: 0 = white, 1 = black
+    last_ns: Optional[int] = None  # monotonic_ns when we last started
     flagged: bool = False
 
+    @property
+    def turn(self) -> str:
+        return "wb"[self.i]
+
+    @turn.setter
+    def turn(self, value: str):
+        self.i = 1 if value == "b" else 0
+
     def to_dict(self):
         return {
-            "w_ms": self.w_ms,
-            "b_ms": self.b_ms,
+            "w_ms": self.ms[0],
+            "b_ms": self.ms[1],
             "increment": self.increment,
             "running": self.running,
             "turn": self.turn,
             "flagged": self.flagged,
         }
 
-    def _now(self) -> float:
-        return time.time()
+    def _now_ns(self) -> int:
+        # Monotonic: immune to wall-clock jumps; integer math end to end.
+        return time.monotonic_ns()
+
+    def _elapsed_ms(self) -> int:
+        return (self._now_ns() - self.last_ns) // 1_000_000
 
     def start(self):
         if self.flagged:
             return
         if not self.running:
             self.running = True
-            self.last_ts = self._now()
+            self.last_ns = self._now_ns()
 
     def pause(self):
-        if self.running and self.last_ts is not None:
-            elapsed = int((self._now() - self.last_ts) * 1000)
-            if self.turn == "w":
-                self.w_ms = max(0, self.w_ms - elapsed)
-            else:
-                self.b_ms = max(0, self.b_ms - elapsed)
+        if self.running and self.last_ns is not None:
+            self.ms[self.i] = max(0, self.ms[self.i] - self._elapsed_ms())
             self.running = False
-            self.last_ts = None
+            self.last_ns = None
             self._check_flagged()
 
     def switch_turn(self):
         """Call after a successful move: apply elapsed + increment and flip turn."""
-        # apply elapsed on current turn
-        if self.running and self.last_ts is not None:
-            elapsed = int((self._now() - self.last_ts) * 1000)
-            if self.turn == "w":
-                self.w_ms = max(0, self.w_ms - elapsed)
-                if self.w_ms == 0:
-                    self.flagged = True
-            else:
-                self.b_ms = max(0, self.b_ms - elapsed)
-                if self.b_ms == 0:
-                    self.flagged = True
-
-        # add increment to the side that just moved
-        if self.turn == "w":
-            self.w_ms += self.increment
-            self.turn = "b"
-        else:
-            self.b_ms += self.increment
-            self.turn = "w"
+        # apply elapsed on the ticking side (branchless via index)
+        if self.running and self.last_ns is not None:
+            remaining = max(0, self.ms[self.i] - self._elapsed_ms())
+            self.ms[self.i] = remaining
+            self.flagged |= remaining == 0
+
+        # add increment to the side that just moved, then flip the index
+        self.ms[self.i] += self.increment
+        self.i ^= 1
 
         # restart timer on new turn
         if not self.flagged:
-            self.last_ts = self._now()
+            self.last_ns = self._now_ns()
             self.running = True
 
     def config(self, minutes: int, increment: int, turn: str = "w"):
-        self.w_ms = minutes * 60 * 1000
-        self.b_ms = minutes * 60 * 1000
+        self.ms = [minutes * 60 * 1000] * 2
         self.increment = increment * 1000
         self.turn = "w" if turn != "b" else "b"
         self.running = False
-        self.last_ts = None
+        self.last_ns = None
         self.flagged = False
 
     def _check_flagged(self):
-        if self.w_ms <= 0 or self.b_ms <= 0:
+        if self.ms[0] <= 0 or self.ms[1] <= 0:
             self.flagged = True
 
 
-clocks = Clocks()  # default 5+0
+# ----------------- Per-session game state -----------------
+# Each browser session gets its own game + clocks keyed by a session cookie,
+# so concurrent clients no longer share (and race on) one module-level board.
+# A fresh secret per process just re-deals anonymous session ids on restart.
+app.secret_key = os.environ.get("CHESS_APP_SECRET") or uuid4().hex
+
+_SESSION_CAP = 256  # LRU-capped so abandoned sessions don't accumulate
+
+
+@dataclass
+class SessionState:
+    game: ChessGame = field(default_factory=ChessGame)
+    clocks: Clocks = field(default_factory=Clocks)  # default 5+0
+    # Last serialized /state body + its etag (see the /state route).
+    state_etag: Optional[str] = None
+    state_payload: Optional[Dict[str, Any]] = None
+
+
+_SESSIONS: "OrderedDict[str, SessionState]" = OrderedDict()
+
+
+def _session() -> SessionState:
+    sid = session.get("sid")
+    if sid is None:
+        sid = session["sid"] = uuid4().hex
+    s = _SESSIONS.get(sid)
+    if s is None:
+        s = _SESSIONS[sid] = SessionState()
+        if len(_SESSIONS) > _SESSION_CAP:
+            _SESSIONS.popitem(last=False)
+    else:
+        _SESSIONS.move_to_end(sid)
+    return s
 
 
 # ----------------- Helpers -----------------
-def flags_from_board(b: chess.Board) -> Dict[str, Any]:
-    """Return UI flags used by the frontend to show check/mate/game_over etc."""
-    f: Dict[str, Any] = {}
-    f["check"] = b.is_check()
-    f["mate"] = b.is_checkmate()
-    f["game_over"] = b.is_game_over(claim_draw=True) or clocks.flagged
-    f["result"] = b.result(claim_draw=True) if b.is_game_over(claim_draw=True) else None
-    # find checked king square if in check
-    if f["check"]:
-        king_sq = b.king(b.turn)
-        if king_sq is not None:
-            f["check_square"] = chess.square_name(king_sq)
+def flags_from_game(s: SessionState) -> Dict[str, Any]:
+    """UI flags for the frontend: the game's per-position cache plus clock state.
+
+    ChessGame.status_flags() memoizes check/mate/game_over per position, so
+    this costs a dict copy instead of move generation on every request.
+    """
+    f = dict(s.game.status_flags())
+    f["game_over"] = f["game_over"] or s.clocks.flagged
     return f
 
 
-def san_list_from_stack(b: chess.Board) -> List[str]:
-    """Return SAN strings in order from initial position."""
-    temp = chess.Board()
-    out: List[str] = []
-    for mv in b.move_stack:
-        out.append(temp.san(mv))
-        temp.push(mv)
-    return out
+def _parse_json() -> Dict[str, Any]:
+    """Request body as a dict, parsed with orjson when available.
+
+    Reads the raw bytes uncached (no second buffer copy) and mirrors
+    get_json(silent=True): empty, invalid or non-object bodies yield {}.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _game_payload(s: SessionState, **extra) -> Dict[str, Any]:
+    """The fen/status/flags/clocks envelope most routes return, computed once
+    per response; keyword overrides/extras are merged on top."""
+    payload = {
+        "fen": s.game.get_fen(),
+        "status": s.game.game_status(),
+        "flags": flags_from_game(s),
+        "clocks": s.clocks.to_dict(),
+    }
+    payload.update(extra)
+    return payload
 
 
 # ----------------- Routes: SPA + Board -----------------
@@ -183,263 +265,374 @@ def spa_home():
 
 @app.route("/board")
 def board_screen():
+    s = _session()
     return render_template(
-        "board.html", fen=game.board.fen(), status=game.game_status()
+        "board.html", fen=s.game.get_fen(), status=s.game.game_status()
     )
 
 
+# Shape check for UCI move strings, compiled once: garbage input is rejected
+# before it touches move parsing or the board.
+UCI_RE = re.compile(r"^[a-h][1-8][a-h][1-8][qrbn]?$")
+
+
 # ----------------- Game actions -----------------
 @app.route("/legal/<square>")
 def legal(square: str):
-    moves = game.legal_moves_from(square)
+    moves = _session().game.legal_moves_from(square)
     return jsonify({"from": square, "legal": moves})
 
 
 @app.route("/move", methods=["POST"])
 def move():
-    data = request.get_json(silent=True) or {}
+    s = _session()
+    data = _parse_json()
     uci = data.get("move", "")
     promo = data.get("promotion")
     # append promotion letter if provided (e7e8q)
     if promo and len(uci) == 4:
         uci = uci + str(promo).lower()
 
-    if clocks.flagged:
+    if not UCI_RE.match(uci):
+        return (
+            jsonify(_game_payload(s, success=False, error=f"Illegal move: {uci}")),
+            200,
+        )
+
+    if s.clocks.flagged:
         return (
             jsonify(
-                {
-                    "success": False,
-                    "fen": game.board.fen(),
-                    "status": "Game Over (time)",
-                    "flags": flags_from_board(game.board),
-                    "clocks": clocks.to_dict(),
-                    "error": "Game already ended on time.",
-                }
+                _game_payload(
+                    s,
+                    success=False,
+                    status="Game Over (time)",
+                    error="Game already ended on time.",
+                )
             ),
             200,
         )
 
-    ok = game.push_move(uci)
+    ok = s.game.push_move(uci)
     if not ok:
         return (
-            jsonify(
-                {
-                    "success": False,
-                    "fen": game.board.fen(),
-                    "status": game.game_status(),
-                    "flags": flags_from_board(game.board),
-                    "clocks": clocks.to_dict(),
-                    "error": f"Illegal move: {uci}",
-                }
-            ),
+            jsonify(_game_payload(s, success=False, error=f"Illegal move: {uci}")),
             200,
         )
 
     # switch clocks turn after a successful move
-    clocks.switch_turn()
-
-    # if the game ended by mate/draw, pause clocks
-    if game.board.is_game_over(claim_draw=True):
-        clocks.pause()
-
-    return jsonify(
-        {
-            "success": True,
-            "fen": game.board.fen(),
-            "status": game.game_status(),
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
-    )
+    s.clocks.switch_turn()
+
+    # if the game ended by mate/draw, pause clocks — same predicate the
+    # reported flags use, so the clock never freezes on a "running" game
+    if s.game.status_flags()["game_over"]:
+        s.clocks.pause()
+
+    return jsonify(_game_payload(s, success=True))
 
 
 @app.route("/reset", methods=["POST"])
 def reset():
-    global game, clocks
-    game = ChessGame()
-    clocks = Clocks()  # reset to default 5+0
-    return jsonify(
-        {
-            "success": True,
-            "fen": game.board.fen(),
-            "status": game.game_status(),
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
+    s = _session()
+    s.game = ChessGame()
+    s.clocks = Clocks()  # reset to default 5+0
+    return jsonify(_game_payload(s, success=True))
+
+
+def _state_etag(s: SessionState) -> str:
+    # Cheap version tag over everything /state reports: position (zobrist +
+    # ply), clock values and run state. Pure integer formatting, no FEN.
+    g, c = s.game, s.clocks
+    return (
+        f'"{len(g.board.move_stack)}-{g._zobrist & 0xFFFFFFFFFFFF:x}'
+        f"-{c.last_ns or 0}-{c.ms[0]}-{c.ms[1]}"
+        f'-{int(c.running)}{int(c.flagged)}{c.i}"'
     )
 
 
 @app.route("/state")
 def state():
-    return jsonify(
-        {
-            "fen": game.board.fen(),
-            "status": game.game_status(),
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
-    )
+    # The session holds the last serialized body keyed by its etag: idle
+    # polling rebuilds nothing, and an If-None-Match hit skips serialization
+    # entirely.
+    s = _session()
+    etag = _state_etag(s)
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304)
+    if s.state_etag != etag:
+        s.state_etag = etag
+        s.state_payload = _game_payload(s)
+    resp = jsonify(s.state_payload)
+    resp.headers["ETag"] = etag
+    return resp
 
 
 # ----------------- Clocks -----------------
 @app.route("/clock/config", methods=["POST"])
 def clock_config():
-    data = request.get_json(silent=True) or {}
+    s = _session()
+    data = _parse_json()
     minutes = int(data.get("minutes", 5))
     increment = int(data.get("increment", 0))
     turn = data.get("turn", "w")
-    clocks.config(minutes=minutes, increment=increment, turn=turn)
-    return jsonify({"success": True, "clocks": clocks.to_dict()})
+    s.clocks.config(minutes=minutes, increment=increment, turn=turn)
+    return jsonify({"success": True, "clocks": s.clocks.to_dict()})
 
 
 @app.route("/clock/start", methods=["POST"])
 def clock_start():
-    clocks.start()
-    return jsonify({"success": True, "clocks": clocks.to_dict()})
+    s = _session()
+    s.clocks.start()
+    return jsonify({"success": True, "clocks": s.clocks.to_dict()})
 
 
 @app.route("/clock/pause", methods=["POST"])
 def clock_pause():
-    clocks.pause()
-    return jsonify({"success": True, "clocks": clocks.to_dict()})
+    s = _session()
+    s.clocks.pause()
+    return jsonify({"success": True, "clocks": s.clocks.to_dict()})
 
 
 # ----------------- FEN / PGN -----------------
 @app.route("/set_fen", methods=["POST"])
 def set_fen():
-    data = request.get_json(silent=True) or {}
+    s = _session()
+    data = _parse_json()
     fen = data.get("fen", "")
-    ok = game.set_fen(fen)
+    ok = s.game.set_fen(fen)
     if not ok:
         return jsonify({"success": False, "error": "Invalid FEN"}), 200
     # after setting a position, pause and reset clock turn to side-to-move
-    clocks.pause()
-    clocks.turn = "w" if game.board.turn else "b"
-    return jsonify(
-        {
-            "success": True,
-            "fen": game.get_fen(),
-            "status": game.game_status(),
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
-    )
+    s.clocks.pause()
+    s.clocks.turn = "w" if s.game.board.turn else "b"
+    return jsonify(_game_payload(s, success=True))
 
 
 @app.route("/import_pgn", methods=["POST"])
 def import_pgn():
-    data = request.get_json(silent=True) or {}
+    s = _session()
+    data = _parse_json()
     pgn = data.get("pgn", "")
-    ok = game.import_pgn(pgn)
+    ok = s.game.import_pgn(pgn)
     if not ok:
         return jsonify({"success": False, "error": "Invalid PGN"}), 200
-    clocks.pause()
-    clocks.turn = "w" if game.board.turn else "b"
-    return jsonify(
-        {
-            "success": True,
-            "fen": game.get_fen(),
-            "status": game.game_status(),
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
-    )
+    s.clocks.pause()
+    s.clocks.turn = "w" if s.game.board.turn else "b"
+    return jsonify(_game_payload(s, success=True))
 
 
 @app.route("/export_pgn")
 def export_pgn():
-    pgn_text = game.export_pgn()
+    # iter_pgn streams headers and movetext chunks straight off the game's
+    # SAN cache — the full PGN string is never materialized server-side.
     return Response(
-        pgn_text,
+        stream_with_context(_session().game.iter_pgn()),
         mimetype="text/plain",
         headers={"Content-Disposition": "attachment; filename=game.pgn"},
+        direct_passthrough=True,
     )
 
 
 @app.route("/movelist")
 def movelist():
-    moves = san_list_from_stack(game.board)
+    g = _session().game
+    # The move list only changes with the position, so tag by ply + zobrist.
+    etag = f'"{len(g.board.move_stack)}-{g._zobrist & 0xFFFFFFFFFFFF:x}"'
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304)
+    # ChessGame caches SAN per pushed move, so this is O(1) per refresh.
+    moves = g.san_move_list()
     # collapse into move-numbered pairs on the client; we just send a flat SAN list
-    return jsonify({"success": True, "moves": moves})
+    resp = jsonify({"success": True, "moves": moves})
+    resp.headers["ETag"] = etag
+    return resp
 
 
 # ----------------- AI (Stockfish) -----------------
+@lru_cache(maxsize=1)
+def _cached_probe(bucket: int) -> tuple:
+    # Probing spawns the engine to read its ID banner; the UI polls this
+    # endpoint, so memoize per 30s time bucket instead of paying that per hit.
+    # The body is serialized once per bucket — hits return frozen bytes, no
+    # jsonify pass — and tagged so pollers can 304 out of the transfer too.
+    payload = probe_engine()
+    body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return body, etag
+
+
 @app.route("/ai/probe")
 def ai_probe():
-    return jsonify(probe_engine())
+    body, etag = _cached_probe(int(time.monotonic() // 30))
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304)
+    return Response(
+        body,
+        mimetype="application/json",
+        headers={"ETag": etag, "Cache-Control": "max-age=30"},
+    )
+
+
+# Engine searches block for their full movetime; like /review, they run on a
+# background pool (sized to the adapter's engine pool) and the client polls
+# /ai/result/<job_id>.
+_AI_EXEC = ThreadPoolExecutor(max_workers=3)
+_AI_JOBS: Dict[str, tuple] = {}  # job_id -> (kind, Future, submitted-at)
+
+# Finished jobs are normally removed by the poll that collects them, but a
+# tab closed mid-search never collects; expire abandoned entries so the
+# registries don't grow forever on a long-running server.
+_JOB_TTL_S = 600
+
+
+def _sweep_jobs(jobs: Dict[str, tuple]) -> None:
+    now = time.monotonic()
+    for jid in [j for j, entry in jobs.items() if now - entry[-1] > _JOB_TTL_S]:
+        jobs.pop(jid, None)
+
+
+def _submit_ai(kind: str, fn, data: Dict[str, Any]):
+    _sweep_jobs(_AI_JOBS)
+    job_id = uuid4().hex
+    _AI_JOBS[job_id] = (
+        kind,
+        _AI_EXEC.submit(
+            fn,
+            fen=_session().game.get_fen(),
+            movetime_ms=int(data.get("movetime_ms", 500)),
+            depth=data.get("depth"),
+            skill_level=data.get("skill"),
+        ),
+        time.monotonic(),
+    )
+    return jsonify({"success": True, "job_id": job_id}), 202
 
 
 @app.route("/ai/suggest", methods=["POST"])
 def ai_suggest():
-    data = request.get_json(silent=True) or {}
-    result = analyze_fen(
-        fen=game.board.fen(),
-        movetime_ms=int(data.get("movetime_ms", 500)),
-        depth=data.get("depth"),
-        skill_level=data.get("skill"),
-    )
-    if not result.get("ok"):
-        return jsonify({"success": False, "error": result.get("error")}), 200
-    return jsonify({"success": True, "suggestion": result})
+    data = _parse_json()
+    return _submit_ai("suggest", analyze_fen, data)
 
 
 @app.route("/ai/play", methods=["POST"])
 def ai_play():
-    data = request.get_json(silent=True) or {}
-    result = play_fen(
-        fen=game.board.fen(),
-        movetime_ms=int(data.get("movetime_ms", 500)),
-        depth=data.get("depth"),
-        skill_level=data.get("skill"),
-    )
+    data = _parse_json()
+    return _submit_ai("play", play_fen, data)
+
+
+@app.route("/ai/result/<job_id>")
+def ai_result(job_id: str):
+    entry = _AI_JOBS.get(job_id)
+    if entry is None:
+        return jsonify({"success": False, "error": "Unknown AI job"}), 200
+    kind, fut, _submitted = entry
+    if not fut.done():
+        return jsonify({"success": True, "done": False}), 200
+
+    _AI_JOBS.pop(job_id, None)
+    result = fut.result()
     if not result.get("ok"):
-        return jsonify({"success": False, "error": result.get("error")}), 200
+        return (
+            jsonify({"success": False, "done": True, "error": result.get("error")}),
+            200,
+        )
+    if kind == "suggest":
+        return jsonify({"success": True, "done": True, "suggestion": result})
 
+    s = _session()
     new_fen = result["fen"]
-    # update server board and clocks
+    # update server board and clocks on the collecting request's thread
     try:
-        game.board.set_fen(new_fen)
+        # game.set_fen (not board.set_fen) so the SAN/hash/status caches
+        # follow the new position.
+        s.game.set_fen(new_fen)
         # engine moved for the side-to-move; switch clock as a real move
-        clocks.switch_turn()
-        if game.board.is_game_over(claim_draw=True):
-            clocks.pause()
+        s.clocks.switch_turn()
+        if s.game.status_flags()["game_over"]:
+            s.clocks.pause()
     except Exception:
         pass
 
-    return jsonify(
-        {
-            "success": True,
-            "fen": new_fen,
-            "ai": result,
-            "flags": flags_from_board(game.board),
-            "clocks": clocks.to_dict(),
-        }
-    )
+    return jsonify(_game_payload(s, success=True, done=True, fen=new_fen, ai=result))
 
 
 # ----------------- Reviewer -----------------
+# Reviews run for seconds-to-minutes; doing that inside the request would
+# block a server worker for the duration. Jobs go to a small background pool
+# and the client polls /review/status/<job_id> for the finished report.
+_REVIEW_EXEC = ThreadPoolExecutor(max_workers=2)
+_REVIEWS: Dict[str, tuple] = {}  # job_id -> (Future, submitted-at)
+
+# Finished reports keyed by (pgn digest, movetime, depth, skill): re-opening
+# the same analysis skips the engine walk entirely, which is the whole cost
+# of a review. LRU-capped; lives for the process, like the probe cache.
+_REVIEW_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_REVIEW_CACHE_CAP = 32
+
+
+def _run_review(key: tuple, pgn: str, movetime_ms: int, depth, skill) -> Dict[str, Any]:
+    html = _REVIEW_CACHE.get(key)
+    if html is not None:
+        _REVIEW_CACHE.move_to_end(key)
+        return {"html": html}
+    summary = review_pgn(
+        pgn_text=pgn, movetime_ms=movetime_ms, depth=depth, skill_level=skill
+    )
+    if not getattr(summary, "ok", False):
+        return {"error": getattr(summary, "error", "review failed")}
+    html = render_html_report(summary, title="Game Review")
+    _REVIEW_CACHE[key] = html
+    if len(_REVIEW_CACHE) > _REVIEW_CACHE_CAP:
+        _REVIEW_CACHE.popitem(last=False)
+    return {"html": html}
+
+
 @app.route("/review", methods=["POST"])
 def review_endpoint():
-    data = request.get_json(silent=True) or {}
-    pgn = data.get("pgn") or game.export_pgn()
+    data = _parse_json()
+    pgn = data.get("pgn") or _session().game.export_pgn()
     movetime_ms = int(data.get("movetime_ms", 200))
     depth = data.get("depth")
     skill = data.get("skill")
 
-    summary = review_pgn(
-        pgn_text=pgn, movetime_ms=movetime_ms, depth=depth, skill_level=skill
+    # Hash the PGN rather than keying on the full text; blake2b is the
+    # fastest digest in the stdlib.
+    key = (
+        hashlib.blake2b(pgn.encode(), digest_size=16).hexdigest(),
+        movetime_ms,
+        depth,
+        skill,
     )
-    if not getattr(summary, "ok", False):
+    _sweep_jobs(_REVIEWS)
+    job_id = uuid4().hex
+    # Cache hits go through the same job path and resolve on the first poll.
+    _REVIEWS[job_id] = (
+        _REVIEW_EXEC.submit(_run_review, key, pgn, movetime_ms, depth, skill),
+        time.monotonic(),
+    )
+    return jsonify({"success": True, "job_id": job_id}), 202
+
+
+@app.route("/review/status/<job_id>")
+def review_status(job_id: str):
+    entry = _REVIEWS.get(job_id)
+    if entry is None:
+        return jsonify({"success": False, "error": "Unknown review job"}), 200
+    fut, _submitted = entry
+    if not fut.done():
+        return jsonify({"success": True, "done": False}), 200
+
+    _REVIEWS.pop(job_id, None)
+    result = fut.result()
+    if "error" in result:
         return (
-            jsonify(
-                {"success": False, "error": getattr(summary, "error", "review failed")}
-            ),
+            jsonify({"success": False, "done": True, "error": result["error"]}),
             200,
         )
-    html = render_html_report(summary, title="Game Review")
-    return jsonify({"success": True, "html": html}), 200
+    return jsonify({"success": True, "done": True, "html": result["html"]}), 200
 
 
 # --------------- Dev entrypoint ---------------
 if __name__ == "__main__":
-    app.run(debug=True, host="127.0.0.1", port=5000)
+    # threaded=True so a long request (engine search, big PGN import) doesn't
+    # stall every other client on the single Werkzeug worker.
+    app.run(debug=True, host="127.0.0.1", port=5000, threaded=True)